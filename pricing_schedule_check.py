@@ -2,14 +2,28 @@
 import sys
 import subprocess
 import json
+import mmap
 import os
+import pickle
+import re
 import signal
 import time
 import threading
+import heapq
+import operator
+from bisect import bisect_left
+from contextlib import closing, contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
-from collections import Counter
+from typing import Optional, Dict, Any, List, Tuple
+from collections import Counter, defaultdict
+
+try:
+    import orjson  # Optional: faster JSON parsing/serialization
+except ImportError:
+    orjson = None
 
 # ============================================================================
 # Cache configuration (shared with site_lookup.py)
@@ -18,9 +32,18 @@ CACHE_DIR = Path.home() / ".cache" / "site_lookup"
 CACHE_FILE = CACHE_DIR / "sites_cache.json"
 CACHE_MAX_AGE_DAYS = 7
 
+# How long site data loaded in this process is reused before re-checking the cache (seconds)
+SITE_DATA_MEMO_SECONDS = 75 * 60
+
+# Pickled copy of the site cache for faster loads (JSON stays authoritative)
+CACHE_PICKLE_FILE = CACHE_DIR / "sites_cache.pkl"
+
 # Progress file for resuming interrupted runs
 PROGRESS_FILE = CACHE_DIR / "pricing_check_progress.json"
 
+# Station results of the interrupted run, appended one JSON object per line
+PROGRESS_RESULTS_FILE = CACHE_DIR / "pricing_check_progress_results.jsonl"
+
 # Odd ones out tracking file
 ODD_ONES_FILE = CACHE_DIR / "pricing_odd_ones_out.json"
 
@@ -30,10 +53,110 @@ PRICING_VALUES_FILE = CACHE_DIR / "pricing_values_cache.json"
 # JWT refresh interval (10 minutes)
 JWT_REFRESH_INTERVAL = 600  # seconds
 
+# Maximum concurrent station API requests (override with PRICING_CHECK_MAX_WORKERS
+# to go easier on the server, or set it to 1 to run sequentially)
+try:
+    MAX_WORKERS = max(1, int(os.environ.get("PRICING_CHECK_MAX_WORKERS", "16")))
+except ValueError:
+    MAX_WORKERS = 16
+
+# Progress lines are flushed to stdout in batches of this many stations
+# (line buffering is switched off for the loop, see batched_stdout)
+PROGRESS_FLUSH_EVERY = 16
+
+# How long fetched configuration values are reused (seconds), per key
+CONFIG_CACHE_TTL = {
+    "PricingScheduleEnable": 60,
+    "PricingSchedule": 300,
+}
+CONFIG_CACHE_DEFAULT_TTL = 60
+
+# Maps PFID dash separators to spaces for parsing
+PFID_SEPARATOR_TRANS = str.maketrans("-", " ")
+
+# First line of an API response that starts the JSON body (after curl debug output)
+JSON_START_RE = re.compile(r'^[ \t]*[\[{]', re.MULTILINE)
+
 # Global state for JWT management
-_jwt_refresh_timer: Optional[threading.Timer] = None
+_jwt_refresh_thread: Optional[threading.Thread] = None
+_jwt_stop_event = threading.Event()
 _jwt_lock = threading.Lock()
 
+# ACN -> sorted ACC IDs index, built lazily from the loaded site data
+_acn_index: Optional[Dict[str, List[str]]] = None
+_acn_index_source: Optional[List[Dict[str, Any]]] = None
+
+# Site data loaded during this run, and when (time.monotonic())
+_site_data: Optional[List[Dict[str, Any]]] = None
+_site_data_loaded_at = 0.0
+
+# Set once CACHE_DIR has been created during this run
+_cache_dir_ready = False
+
+# Shared worker pool for station API calls, created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Futures submitted by run_concurrently that have not been collected yet
+_active_futures = set()
+_active_futures_lock = threading.Lock()
+
+# Configuration cache: pfid -> {key: (expires_at, configuration_key item)}
+_config_cache: Dict[str, Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+_config_cache_lock = threading.Lock()
+
+# In-flight configuration requests: (pfid, keys) -> Future shared by concurrent callers
+_pending_requests: Dict[Tuple[str, Tuple[str, ...]], Future] = {}
+_pending_requests_lock = threading.Lock()
+
+# Per-ACC station indexes: (pfid, entry) pairs sorted by PFID, keyed by (ACN, ACC)
+_station_indexes: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+
+
+# ============================================================================
+# JSON Helpers (orjson when installed, stdlib json otherwise)
+# ============================================================================
+def json_loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, optionally indented by 2 spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def load_json_file(path: Path):
+    """
+    Read and parse a JSON file.
+    With orjson the file is memory-mapped and parsed straight from the page
+    cache instead of being copied into a bytes object first.
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def save_json_file(path: Path, data, indent: bool = False):
+    """
+    Serialize data into a single buffer and write it in one call.
+    The file is written to a temporary sibling and moved into place, so an
+    interrupted write never leaves a truncated file behind.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        payload = json.dumps(data, indent=2 if indent else None).encode()
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
 
 # ============================================================================
 # PFID Parsing
@@ -49,14 +172,8 @@ def parse_pfid_input(args: List[str]) -> Dict[str, Optional[str]]:
     
     Returns dict with keys: acn, acc, acg, acs, mode
     """
-    # Join all args and normalize separators
-    combined = " ".join(args)
-    
-    # Split by both spaces and dashes
-    parts = []
-    for part in combined.replace("-", " ").split():
-        if part.strip():
-            parts.append(part.strip())
+    # Join all args, turn dashes into spaces and split (split() drops empties)
+    parts = " ".join(args).translate(PFID_SEPARATOR_TRANS).split()
     
     result = {
         "acn": None,
@@ -163,38 +280,54 @@ def get_jwt() -> bool:
 
 
 def start_jwt_refresh_timer():
-    """Start a background timer to refresh JWT every 10 minutes."""
-    global _jwt_refresh_timer
-    
-    def refresh_jwt():
-        global _jwt_refresh_timer
-        with _jwt_lock:
-            print("\n[INFO] Refreshing JWT token (10 minute interval)...")
-            if get_jwt():
-                print("[INFO] JWT refreshed successfully")
-            else:
-                print("[WARNING] JWT refresh failed - API calls may fail")
-            
-            # Schedule next refresh
-            _jwt_refresh_timer = threading.Timer(JWT_REFRESH_INTERVAL, refresh_jwt)
-            _jwt_refresh_timer.daemon = True
-            _jwt_refresh_timer.start()
+    """Start a background thread to refresh JWT every 10 minutes."""
+    global _jwt_refresh_thread, _jwt_stop_event
     
-    # Cancel any existing timer
+    # Stop any existing refresh thread
     stop_jwt_refresh_timer()
     
-    # Start new timer
-    _jwt_refresh_timer = threading.Timer(JWT_REFRESH_INTERVAL, refresh_jwt)
-    _jwt_refresh_timer.daemon = True
-    _jwt_refresh_timer.start()
+    stop_event = threading.Event()
+    
+    def refresh_loop():
+        # wait() returns True as soon as the stop event is set
+        while not stop_event.wait(JWT_REFRESH_INTERVAL):
+            with _jwt_lock:
+                print("\n[INFO] Refreshing JWT token (10 minute interval)...")
+                if get_jwt():
+                    print("[INFO] JWT refreshed successfully")
+                else:
+                    print("[WARNING] JWT refresh failed - API calls may fail")
+    
+    _jwt_stop_event = stop_event
+    _jwt_refresh_thread = threading.Thread(target=refresh_loop, name="jwt-refresh", daemon=True)
+    _jwt_refresh_thread.start()
 
 
 def stop_jwt_refresh_timer():
-    """Stop the JWT refresh timer."""
-    global _jwt_refresh_timer
-    if _jwt_refresh_timer is not None:
-        _jwt_refresh_timer.cancel()
-        _jwt_refresh_timer = None
+    """Stop the JWT refresh thread."""
+    global _jwt_refresh_thread
+    if _jwt_refresh_thread is not None:
+        _jwt_stop_event.set()
+        _jwt_refresh_thread = None
+
+
+def get_api_env() -> Dict[str, str]:
+    """Snapshot the environment (including EDF_JWT) without racing a refresh."""
+    with _jwt_lock:
+        return os.environ.copy()
+
+
+def refresh_expired_jwt(stale_jwt: Optional[str]) -> bool:
+    """
+    Refresh an expired JWT from a worker thread.
+    Only the first caller holding the stale token refreshes; the others
+    reuse the token it obtained.
+    """
+    with _jwt_lock:
+        if os.environ.get("EDF_JWT") != stale_jwt:
+            return True
+        print("\n[INFO] JWT token has expired. Refreshing...")
+        return get_jwt()
 
 
 # ============================================================================
@@ -206,8 +339,7 @@ def load_pricing_values_cache() -> Dict[str, Any]:
         return {}
     
     try:
-        with open(PRICING_VALUES_FILE, 'r') as f:
-            return json.load(f)
+        return load_json_file(PRICING_VALUES_FILE)
     except (json.JSONDecodeError, IOError) as e:
         print(f"[WARNING] Failed to load pricing values cache: {e}")
         return {}
@@ -216,9 +348,8 @@ def load_pricing_values_cache() -> Dict[str, Any]:
 def save_pricing_values_cache(data: Dict[str, Any]):
     """Save pricing values cache."""
     try:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(PRICING_VALUES_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        ensure_cache_dir()
+        save_json_file(PRICING_VALUES_FILE, data, indent=True)
     except IOError as e:
         print(f"[WARNING] Failed to save pricing values cache: {e}")
 
@@ -255,20 +386,15 @@ def calculate_majority_pricing(acn_id: str, acc_id: str) -> Optional[float]:
     print(f"  🔍 Calculating majority pricing for ACC {acn_id}-{acc_id}...")
     
     # Fetch station data
-    stations = fetch_station_data(acn_id, acc_id)
+    stations = get_station_index(acn_id, acc_id)
     
     if not stations:
         print(f"  ⚠️  No stations found for ACC {acc_id}")
         return None
     
     # Filter for LiteON stations
-    liteon_pfids = []
-    for entry in stations.values():
-        if not entry.get("pfid"):
-            continue
-        evse_type = entry.get("evse_type", "Unknown")
-        if "liteon" in evse_type.lower():
-            liteon_pfids.append(entry.get("pfid"))
+    is_liteon = is_liteon_model
+    liteon_pfids = [pfid for pfid, entry in stations if is_liteon(entry.get("evse_type", "Unknown"))]
     
     if not liteon_pfids:
         print(f"  ⚠️  No LiteON stations found for ACC {acc_id}")
@@ -281,9 +407,9 @@ def calculate_majority_pricing(acn_id: str, acc_id: str) -> Optional[float]:
     f_values = []
     print(f"  📊 Sampling {sample_size} station(s) to determine pricing...")
     
+    responses = fetch_configurations_bulk(sample_pfids, "PricingSchedule")
     for pfid in sample_pfids:
-        response = get_configuration(pfid, "PricingSchedule")
-        schedule = extract_pricing_schedule(response)
+        schedule = extract_pricing_schedule(responses[pfid])
         
         if schedule:
             # Extract all f values from the schedule
@@ -445,36 +571,87 @@ def get_pricing_value_for_acc(acn_id: str, acc_id: str, pricing_mode: str,
 # ============================================================================
 # Cache Management (shared with site_lookup.py)
 # ============================================================================
-def is_cache_valid() -> bool:
+def ensure_cache_dir():
+    """Create CACHE_DIR on first use; later calls skip the mkdir."""
+    global _cache_dir_ready
+    if not _cache_dir_ready:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_dir_ready = True
+
+
+def get_cache_stat() -> Optional[os.stat_result]:
+    """Stat the cache file, or return None if it does not exist."""
+    try:
+        return CACHE_FILE.stat()
+    except FileNotFoundError:
+        return None
+
+
+def get_cache_age(cache_stat: os.stat_result) -> timedelta:
+    """Get the age of the cache file from its stat result."""
+    return datetime.now() - datetime.fromtimestamp(cache_stat.st_mtime)
+
+
+def is_cache_valid(cache_stat: Optional[os.stat_result] = None) -> bool:
     """Check if the cache file exists and is less than 7 days old."""
-    if not CACHE_FILE.exists():
+    if cache_stat is None:
+        cache_stat = get_cache_stat()
+    if cache_stat is None:
         return False
     
-    cache_mtime = datetime.fromtimestamp(CACHE_FILE.stat().st_mtime)
-    cache_age = datetime.now() - cache_mtime
-    
-    return cache_age < timedelta(days=CACHE_MAX_AGE_DAYS)
+    return get_cache_age(cache_stat) < timedelta(days=CACHE_MAX_AGE_DAYS)
 
 
-def load_cached_data() -> Optional[List[Dict[str, Any]]]:
-    """Load site data from cache file."""
-    if not CACHE_FILE.exists():
+def load_cached_data(cache_stat: Optional[os.stat_result] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load site data from cache file. Pass cache_stat to skip the existence check.
+    The pickle sidecar is used when it is at least as new as the JSON file.
+    """
+    if cache_stat is None:
+        cache_stat = get_cache_stat()
+    if cache_stat is None:
         return None
     
     try:
-        with open(CACHE_FILE, 'r') as f:
-            return json.load(f)
+        pickle_stat = CACHE_PICKLE_FILE.stat()
+    except FileNotFoundError:
+        pickle_stat = None
+    
+    if pickle_stat is not None and pickle_stat.st_mtime_ns >= cache_stat.st_mtime_ns:
+        try:
+            with open(CACHE_PICKLE_FILE, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[WARNING] Failed to load pickled cache, using JSON: {e}")
+    
+    try:
+        data = load_json_file(CACHE_FILE)
     except (json.JSONDecodeError, IOError) as e:
         print(f"[WARNING] Failed to load cache: {e}")
         return None
+    
+    # JSON is newer (or was written by site_lookup.py) - refresh the sidecar
+    save_cache_pickle(data)
+    return data
+
+
+def save_cache_pickle(data: List[Dict[str, Any]]):
+    """Save the pickle sidecar of the site cache."""
+    try:
+        tmp_path = CACHE_PICKLE_FILE.with_name(CACHE_PICKLE_FILE.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CACHE_PICKLE_FILE)
+    except (IOError, pickle.PicklingError) as e:
+        print(f"[WARNING] Failed to save pickled cache: {e}")
 
 
 def save_to_cache(data: List[Dict[str, Any]]):
     """Save site data to cache file."""
     try:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(data, f)
+        ensure_cache_dir()
+        save_json_file(CACHE_FILE, data)
+        save_cache_pickle(data)
         print(f"[INFO] Cache updated: {CACHE_FILE}")
     except IOError as e:
         print(f"[WARNING] Failed to save cache: {e}")
@@ -484,49 +661,46 @@ def fetch_site_data_from_api() -> List[Dict[str, Any]]:
     """Fetch site data from PowerFlex API."""
     print("[INFO] Fetching site data from PowerFlex API...")
     
+    url = "https://powerflex.io/asset-mgmt/api/site?barebones=true"
     try:
-        result = subprocess.run([
-            'curl_device_manager.sh',
-            '-H', 'Content-Type: application/json',
-            '-X', 'GET',
-            'https://powerflex.io/asset-mgmt/api/site?barebones=true'
-        ], capture_output=True, text=True, check=True)
+        stale_jwt = get_api_env().get("EDF_JWT")
+        stdout = device_manager_request("GET", url)
         
-        # Check for JWT expiration
-        if "Jwt is expired" in result.stdout or "expired" in result.stdout.lower():
-            print("[ERROR] JWT token has expired. Attempting refresh...")
-            if get_jwt():
-                # Retry the request
-                result = subprocess.run([
-                    'curl_device_manager.sh',
-                    '-H', 'Content-Type: application/json',
-                    '-X', 'GET',
-                    'https://powerflex.io/asset-mgmt/api/site?barebones=true'
-                ], capture_output=True, text=True, check=True)
-            else:
+        # The site endpoint may word expiry differently from "Jwt is expired",
+        # so any mention of "expired" gets one refresh and retry
+        if "expired" in stdout.lower():
+            if not refresh_expired_jwt(stale_jwt):
+                print("[ERROR] JWT token has expired and could not be refreshed")
+                sys.exit(1)
+            stdout = device_manager_request("GET", url)
+            # Only the exact expiry message counts now: the site list itself may mention "expired"
+            if "Jwt is expired" in stdout:
+                print("[ERROR] JWT token has expired and could not be refreshed")
                 sys.exit(1)
         
         # Find the JSON content (skip curl debug output)
-        stdout_lines = result.stdout.strip().split('\n')
-        json_content = ""
-        json_started = False
-        
-        for line in stdout_lines:
-            if line.strip().startswith('[') or line.strip().startswith('{'):
-                json_started = True
-            if json_started:
-                json_content += line + "\n"
-        
-        if not json_content.strip():
+        json_start = JSON_START_RE.search(stdout)
+        if not json_start:
             print("[ERROR] No valid JSON data received from API")
             sys.exit(1)
         
-        data = json.loads(json_content)
+        data = json_loads(stdout[json_start.start():])
+        
+        # An error body is a single object, not a site; never cache it
+        if isinstance(data, dict) and ("error" in data or "message" in data):
+            print(f"[ERROR] API returned an error instead of site data: {data.get('error') or data.get('message')}")
+            sys.exit(1)
         
         # Ensure it's a list
         if not isinstance(data, list):
             data = [data]
         
+        # Drop anything that isn't a site record
+        sites = [site for site in data if isinstance(site, dict)]
+        if len(sites) != len(data):
+            print(f"[WARNING] Ignoring {len(data) - len(sites)} malformed site record(s)")
+            data = sites
+        
         # Save to cache
         save_to_cache(data)
         
@@ -540,30 +714,66 @@ def fetch_site_data_from_api() -> List[Dict[str, Any]]:
         sys.exit(1)
 
 
+def clear_site_data_cache():
+    """Forget the site data loaded during this run so the next call reloads it."""
+    global _site_data, _acn_index
+    _site_data = None
+    _acn_index = None
+
+
 def get_site_data(refresh: bool = False) -> List[Dict[str, Any]]:
-    """Get site data from cache or API."""
-    if not refresh and is_cache_valid():
+    """
+    Get site data from cache or API.
+    Data loaded during this run is reused for SITE_DATA_MEMO_SECONDS, so
+    repeated calls (e.g. while retrying many sites) skip the disk and API.
+    """
+    global _site_data, _site_data_loaded_at
+    if refresh:
+        clear_site_data_cache()
+    elif _site_data is not None and time.monotonic() - _site_data_loaded_at < SITE_DATA_MEMO_SECONDS:
+        return _site_data
+    
+    # Stat the cache once and reuse the result for validity, age and loading
+    cache_stat = get_cache_stat()
+    
+    site_data = None
+    if not refresh and is_cache_valid(cache_stat):
         print("[INFO] Using cached site data")
-        cached_data = load_cached_data()
-        if cached_data:
-            return cached_data
-    elif CACHE_FILE.exists():
-        cache_mtime = datetime.fromtimestamp(CACHE_FILE.stat().st_mtime)
-        cache_age = datetime.now() - cache_mtime
+        site_data = load_cached_data(cache_stat)
+    elif cache_stat is not None:
+        cache_age = get_cache_age(cache_stat)
         print(f"[INFO] Cache is {cache_age.days} days old (max {CACHE_MAX_AGE_DAYS} days). Refreshing...")
     
-    return fetch_site_data_from_api()
+    if not site_data:
+        site_data = fetch_site_data_from_api()
+    
+    # Don't remember failed/empty loads so a later call can retry
+    if site_data:
+        _site_data = site_data
+        _site_data_loaded_at = time.monotonic()
+    return site_data
+
+
+def build_acn_index(site_data: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Build a mapping of ACN ID to its sorted ACC IDs in a single pass."""
+    accs_by_acn = defaultdict(set)
+    for site in site_data:
+        acc_id = site.get('acc_id')
+        if acc_id:
+            accs_by_acn[site.get('acn_id')].add(acc_id)
+    return {acn_id: sorted(accs) for acn_id, accs in accs_by_acn.items()}
 
 
 def get_accs_for_acn(site_data: List[Dict[str, Any]], acn_id: str) -> List[str]:
     """Get all ACC IDs for a given ACN ID from the site data."""
-    accs = set()
-    for site in site_data:
-        if site.get('acn_id') == acn_id:
-            acc_id = site.get('acc_id')
-            if acc_id:
-                accs.add(acc_id)
-    return sorted(list(accs))
+    global _acn_index, _acn_index_source
+    
+    # Rebuild the index only when called with a different site data list
+    if _acn_index is None or _acn_index_source is not site_data:
+        _acn_index = build_acn_index(site_data)
+        _acn_index_source = site_data
+    
+    return list(_acn_index.get(acn_id, []))
 
 
 # ============================================================================
@@ -575,8 +785,7 @@ def load_progress() -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
+        return load_json_file(PROGRESS_FILE)
     except (json.JSONDecodeError, IOError):
         return None
 
@@ -584,20 +793,59 @@ def load_progress() -> Optional[Dict[str, Any]]:
 def save_progress(progress: Dict[str, Any]):
     """Save progress to file."""
     try:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(PROGRESS_FILE, 'w') as f:
-            json.dump(progress, f, indent=2)
+        ensure_cache_dir()
+        save_json_file(PROGRESS_FILE, progress, indent=True)
     except IOError as e:
         print(f"[WARNING] Failed to save progress: {e}")
 
 
 def delete_progress():
-    """Delete progress file."""
+    """Delete progress files."""
+    for path in (PROGRESS_FILE, PROGRESS_RESULTS_FILE):
+        try:
+            if path.exists():
+                path.unlink()
+        except IOError:
+            pass
+
+
+def load_progress_results(completed_accs: List[str]) -> List[Dict[str, Any]]:
+    """
+    Load the saved station results of completed ACCs.
+    Results of an ACC that was interrupted half-way are dropped so it is
+    checked again from scratch.
+    """
+    if not PROGRESS_RESULTS_FILE.exists():
+        return []
+    
+    completed = set(completed_accs)
+    results = []
     try:
-        if PROGRESS_FILE.exists():
-            PROGRESS_FILE.unlink()
-    except IOError:
-        pass
+        with open(PROGRESS_RESULTS_FILE, 'r') as f:
+            for line in f:
+                try:
+                    result = json_loads(line)
+                except (json.JSONDecodeError, ValueError):
+                    continue  # e.g. a line cut short by an interrupted write
+                if result.get("acc_id") in completed:
+                    results.append(result)
+    except IOError as e:
+        print(f"[WARNING] Failed to load progress results: {e}")
+    return results
+
+
+def write_progress_results(results: List[Dict[str, Any]], append: bool = True):
+    """
+    Write station results to the progress results file.
+    Appending keeps each save proportional to the new results instead of
+    rewriting everything checked so far.
+    """
+    try:
+        ensure_cache_dir()
+        with open(PROGRESS_RESULTS_FILE, 'a' if append else 'w') as f:
+            f.write("".join(json_dumps(result) + "\n" for result in results))
+    except IOError as e:
+        print(f"[WARNING] Failed to save progress results: {e}")
 
 
 # ============================================================================
@@ -622,19 +870,42 @@ def get_site_key(acn_id: str, acc_id: str = None, acg_id: str = None, acs_id: st
         return f"{acn_id}-{acc_id}-{acg_id}-{acs_id}"
 
 
+def count_pending_stations(stations: Dict[str, Dict[str, Any]]) -> int:
+    """Count stations that have not been accepted yet."""
+    return sum(1 for s in stations.values() if s.get("update_status") != "accepted")
+
+
+def index_stations_by_pfid(stations: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Key a list of stations by PFID; the first station with a PFID wins."""
+    indexed = {}
+    for station in stations:
+        pfid = station.get("pfid")
+        # Stations without a PFID can't be tracked (and can't be JSON keys)
+        if pfid:
+            indexed.setdefault(pfid, station)
+    return indexed
+
+
 def load_all_odd_ones_out() -> Dict[str, Any]:
     """Load the entire odd ones out file."""
     if not ODD_ONES_FILE.exists():
         return {"sites": {}}
     
     try:
-        with open(ODD_ONES_FILE, 'r') as f:
-            data = json.load(f)
-            # Migrate old format to new format if needed
-            if "sites" not in data and "stations" in data:
-                # Old format - migrate
-                return {"sites": {}}
-            return data
+        data = load_json_file(ODD_ONES_FILE)
+        # Migrate old format to new format if needed
+        if "sites" not in data and "stations" in data:
+            # Old format - migrate
+            return {"sites": {}}
+        for site_data in data.get("sites", {}).values():
+            # Stations used to be stored as a list; key them by PFID
+            stations = site_data.get("stations", {})
+            if isinstance(stations, list):
+                site_data["stations"] = index_stations_by_pfid(stations)
+            # Back-fill pending counts for files written before they were tracked
+            if "pending_count" not in site_data:
+                site_data["pending_count"] = count_pending_stations(site_data.get("stations", {}))
+        return data
     except (json.JSONDecodeError, IOError) as e:
         print(f"[WARNING] Failed to load odd ones out: {e}")
         return {"sites": {}}
@@ -643,9 +914,8 @@ def load_all_odd_ones_out() -> Dict[str, Any]:
 def save_all_odd_ones_out(data: Dict[str, Any]):
     """Save the entire odd ones out file."""
     try:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(ODD_ONES_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        ensure_cache_dir()
+        save_json_file(ODD_ONES_FILE, data, indent=True)
     except IOError as e:
         print(f"[WARNING] Failed to save odd ones out: {e}")
 
@@ -658,7 +928,7 @@ def save_odd_ones_out(odd_ones: List[Dict[str, Any]], correct_schedule: List[Dic
     Supports multiple sites in the same file.
     """
     try:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_cache_dir()
         
         # Determine site key from odd_ones if not provided
         if acn_id is None and odd_ones:
@@ -677,6 +947,7 @@ def save_odd_ones_out(odd_ones: List[Dict[str, Any]], correct_schedule: List[Dic
         
         # Load existing data
         all_data = load_all_odd_ones_out()
+        now = datetime.now().isoformat()
         
         # Create site entry
         site_data = {
@@ -685,25 +956,25 @@ def save_odd_ones_out(odd_ones: List[Dict[str, Any]], correct_schedule: List[Dic
             "acc_id": acc_id,
             "acg_id": acg_id,
             "acs_id": acs_id,
-            "saved_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
+            "saved_at": now,
+            "last_updated": now,
             "correct_schedule": correct_schedule,
-            "stations": []
+            "stations": index_stations_by_pfid([
+                {
+                    "pfid": r.get("pfid"),
+                    "acn_id": r.get("acn_id"),
+                    "acc_id": r.get("acc_id"),
+                    "acg_id": r.get("acg_id"),
+                    "acs_id": r.get("acs_id"),
+                    "current_schedule": r.get("schedule"),
+                    "mismatches": r.get("mismatches"),
+                    "update_status": r.get("update_status", "pending"),
+                    "rejection_reason": r.get("rejection_reason")
+                }
+                for r in odd_ones
+            ])
         }
-        
-        for r in odd_ones:
-            station_data = {
-                "pfid": r.get("pfid"),
-                "acn_id": r.get("acn_id"),
-                "acc_id": r.get("acc_id"),
-                "acg_id": r.get("acg_id"),
-                "acs_id": r.get("acs_id"),
-                "current_schedule": r.get("schedule"),
-                "mismatches": r.get("mismatches"),
-                "update_status": r.get("update_status", "pending"),
-                "rejection_reason": r.get("rejection_reason")
-            }
-            site_data["stations"].append(station_data)
+        site_data["pending_count"] = count_pending_stations(site_data["stations"])
         
         # Update the site in the data
         all_data["sites"][site_key] = site_data
@@ -730,24 +1001,77 @@ def update_odd_ones_status(pfid: str, status: str, rejection_reason: str = None,
     """
     Update the status of a specific station in the odd ones out file.
     """
-    all_data = load_all_odd_ones_out()
+    with StatusBatch(site_key) as batch:
+        batch.set(pfid, status, rejection_reason)
+
+
+class StatusBatch:
+    """
+    Collect station status updates and write them to the odd ones out file
+    in one go when the batch is flushed, or when the with-block exits (also
+    on errors and Ctrl+C).
+    
+    Usage:
+        with StatusBatch(site_key) as batch:
+            batch.set(pfid, "accepted")
+    """
+    
+    def __init__(self, site_key: str = None):
+        self.site_key = site_key
+        self.updates: List[Tuple[str, str, Optional[str]]] = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        return False
     
-    # Find the station across all sites if site_key not provided
-    sites_to_check = [site_key] if site_key else list(all_data.get("sites", {}).keys())
+    def set(self, pfid: str, status: str, rejection_reason: str = None):
+        """Record a station's new status; later calls for a PFID win."""
+        self.updates.append((pfid, status, rejection_reason))
     
-    for sk in sites_to_check:
-        site_data = all_data.get("sites", {}).get(sk)
-        if not site_data:
-            continue
+    def flush(self):
+        """Apply the recorded updates with a single load and a single write."""
+        updates, self.updates = self.updates, []
+        if not updates:
+            return
         
-        for station in site_data.get("stations", []):
-            if station.get("pfid") == pfid:
-                station["update_status"] = status
-                station["rejection_reason"] = rejection_reason
-                station["last_attempt"] = datetime.now().isoformat()
-                site_data["last_updated"] = datetime.now().isoformat()
-                save_all_odd_ones_out(all_data)
-                return
+        all_data = load_all_odd_ones_out()
+        now = datetime.now().isoformat()
+        
+        # Find the stations across all sites if site_key not provided
+        sites = all_data.get("sites", {})
+        site_keys = [self.site_key] if self.site_key else list(sites.keys())
+        
+        # Index PFID -> site once per flush; the first site holding a PFID wins
+        site_by_pfid = {}
+        for sk in site_keys:
+            site_data = sites.get(sk)
+            if site_data:
+                for pfid in site_data.get("stations", {}):
+                    site_by_pfid.setdefault(pfid, site_data)
+        
+        updated = False
+        for pfid, status, rejection_reason in updates:
+            site_data = site_by_pfid.get(pfid)
+            if site_data is None:
+                continue
+            
+            station = site_data["stations"][pfid]
+            
+            # Keep the site's pending count in step with accepted transitions
+            was_accepted = station.get("update_status") == "accepted"
+            if was_accepted != (status == "accepted"):
+                site_data["pending_count"] += 1 if was_accepted else -1
+            station["update_status"] = status
+            station["rejection_reason"] = rejection_reason
+            station["last_attempt"] = now
+            site_data["last_updated"] = now
+            updated = True
+        
+        if updated:
+            save_all_odd_ones_out(all_data)
 
 
 def get_sites_with_pending_work() -> List[Dict[str, Any]]:
@@ -759,12 +1083,13 @@ def get_sites_with_pending_work() -> List[Dict[str, Any]]:
     sites_with_work = []
     
     for site_key, site_data in all_data.get("sites", {}).items():
-        stations = site_data.get("stations", [])
+        stations = site_data.get("stations", {})
         
-        pending = len([s for s in stations if s.get("update_status") == "pending"])
-        rejected = len([s for s in stations if s.get("update_status") == "rejected"])
-        errored = len([s for s in stations if s.get("update_status") == "error"])
-        accepted = len([s for s in stations if s.get("update_status") == "accepted"])
+        status_counts = Counter(s.get("update_status") for s in stations.values())
+        pending = status_counts["pending"]
+        rejected = status_counts["rejected"]
+        errored = status_counts["error"]
+        accepted = status_counts["accepted"]
         
         total_pending = pending + rejected + errored
         
@@ -800,10 +1125,7 @@ def remove_completed_site(site_key: str):
     if not site_data:
         return
     
-    stations = site_data.get("stations", [])
-    all_accepted = all(s.get("update_status") == "accepted" for s in stations)
-    
-    if all_accepted:
+    if site_data.get("pending_count", 0) == 0:
         del all_data["sites"][site_key]
         save_all_odd_ones_out(all_data)
         print(f"[INFO] Site {site_key} completed and removed from tracking.")
@@ -841,18 +1163,38 @@ def check_resume_progress() -> Optional[Dict[str, Any]]:
 # ============================================================================
 # API Functions
 # ============================================================================
-def fetch_station_data(acn_id, acc_id):
-    """Fetch all station data for a given ACN/ACC."""
-    url = f"https://powerflex.io/session-manager/stations/dashboard/acn/{acn_id}?acc={acc_id}"
+def device_manager_request(method: str, url: str, payload: Any = None) -> str:
+    """
+    Make an authenticated PowerFlex API call via curl_device_manager.sh.
+    If the JWT has expired, refresh it once and retry.
+    payload is sent as JSON; a str payload is taken as an already-encoded body.
+    Returns the raw response body; raises subprocess.CalledProcessError on failure.
+    """
     cmd = [
         "curl_device_manager.sh",
-        "-X", "GET",
+        "-X", method,
         url,
-        "--header", "Content-Type: application/json"
+        "-H", "accept: application/json",
+        "-H", "Content-Type: application/json"
     ]
+    if payload is not None:
+        cmd += ["-d", payload if isinstance(payload, str) else json_dumps(payload)]
+    
+    env = get_api_env()
+    result = subprocess.run(cmd, capture_output=True, check=True, text=True, env=env)
+    
+    # Retry once if the token expired mid-run
+    if "Jwt is expired" in result.stdout and refresh_expired_jwt(env.get("EDF_JWT")):
+        result = subprocess.run(cmd, capture_output=True, check=True, text=True, env=get_api_env())
+    
+    return result.stdout
+
+
+def fetch_station_data(acn_id, acc_id):
+    """Fetch all station data for a given ACN/ACC."""
+    url = f"https://powerflex.io/session-manager/stations/dashboard/acn/{acn_id}?acc={acc_id}"
     try:
-        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        return json.loads(result.stdout)
+        return json_loads(device_manager_request("GET", url))
     except subprocess.CalledProcessError as e:
         print(f"[ERROR] Error fetching station data: {e}")
         return {}
@@ -861,75 +1203,336 @@ def fetch_station_data(acn_id, acc_id):
         return {}
 
 
+def get_station_index(acn_id: str, acc_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Get an ACC's stations as (pfid, entry) pairs sorted by PFID.
+    Station data is fetched once per ACC and reused for the rest of the run,
+    so majority pricing and the station check share a single fetch.
+    Entries without a PFID are skipped.
+    """
+    key = (acn_id, acc_id)
+    index = _station_indexes.get(key)
+    if index is None:
+        stations = fetch_station_data(acn_id, acc_id)
+        index = sorted(
+            ((entry["pfid"], entry) for entry in stations.values() if entry.get("pfid")),
+            key=lambda item: item[0]
+        )
+        # Don't remember failed/empty fetches so a later call can retry
+        if index:
+            _station_indexes[key] = index
+    return index
+
+
+def stations_with_prefix(index: List[Tuple[str, Dict[str, Any]]], pfid_prefix: str = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Get the (pfid, entry) pairs whose PFID starts with pfid_prefix.
+    The index is sorted, so the matches form one contiguous slice found by
+    binary search instead of testing every station.
+    """
+    if not pfid_prefix:
+        return index
+    start = bisect_left(index, (pfid_prefix,))
+    end = bisect_left(index, (pfid_prefix + "\uffff",), start)
+    return index[start:end]
+
+
 def get_configuration(pfid, key):
     """Get a configuration value from a station."""
+    return get_configuration_keys(pfid, [key])
+
+
+def get_configuration_keys(pfid, keys: List[str]):
+    """
+    Get several configuration values from a station in one request.
+    Values fetched within their CONFIG_CACHE_TTL are served from memory;
+    only the missing keys are requested from the station.
+    """
+    now = time.monotonic()
+    cached_items = []
+    missing_keys = []
+    with _config_cache_lock:
+        station_cache = _config_cache.get(pfid, {})
+        for key in keys:
+            entry = station_cache.get(key)
+            if entry is not None and entry[0] > now:
+                cached_items.append(entry[1])
+            else:
+                missing_keys.append(key)
+    
+    if not missing_keys:
+        return {"natsResponse": {"configuration_key": cached_items}}
+    
+    response = fetch_configuration_keys_shared(pfid, missing_keys)
+    fetched_items = cache_configuration_items(pfid, response)
+    
+    if not cached_items or fetched_items is None:
+        return response
+    
+    # Merge the cached values into the fresh response
+    merged = dict(response)
+    merged["natsResponse"] = dict(response["natsResponse"], configuration_key=cached_items + fetched_items)
+    return merged
+
+
+def fetch_configuration_keys(pfid, keys: List[str]):
+    """Request configuration values from a station, bypassing the cache."""
     url = f"https://powerflex.io/edge-device-manager/ocppCommands/get_configuration/{pfid}"
-    cmd = [
-        "curl_device_manager.sh",
-        "-X", "POST",
-        url,
-        "-H", "accept: application/json",
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps({"key": [key]})
-    ]
     try:
-        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        return json.loads(result.stdout)
+        return json_loads(device_manager_request("POST", url, {"key": keys}))
     except subprocess.CalledProcessError as e:
         return {"error": str(e)}
     except json.JSONDecodeError:
         return {"error": "Invalid JSON response"}
 
 
+def fetch_configuration_keys_shared(pfid, keys: List[str]):
+    """
+    Request configuration values from a station. Concurrent callers asking
+    for the same station and keys wait on the request already in flight
+    instead of sending their own.
+    """
+    request_key = (pfid, tuple(keys))
+    with _pending_requests_lock:
+        future = _pending_requests.get(request_key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _pending_requests[request_key] = future
+    
+    if not is_owner:
+        return future.result()
+    
+    try:
+        response = fetch_configuration_keys(pfid, keys)
+        future.set_result(response)
+        return response
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _pending_requests_lock:
+            _pending_requests.pop(request_key, None)
+
+
+def cache_configuration_items(pfid, response) -> Optional[List[Dict[str, Any]]]:
+    """
+    Remember the configuration_key items of a successful response.
+    Returns the items, or None if the response carried none.
+    """
+    try:
+        items = response["natsResponse"]["configuration_key"]
+        keys = [item["key"] for item in items]
+    except (TypeError, KeyError):
+        return None
+    
+    now = time.monotonic()
+    with _config_cache_lock:
+        station_cache = _config_cache.setdefault(pfid, {})
+        for key, item in zip(keys, items):
+            station_cache[key] = (now + CONFIG_CACHE_TTL.get(key, CONFIG_CACHE_DEFAULT_TTL), item)
+    return items
+
+
+def invalidate_configuration(pfid):
+    """Forget all cached configuration values of a station."""
+    with _config_cache_lock:
+        _config_cache.pop(pfid, None)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared worker pool for station API calls.
+    One pool is reused for the whole run (e.g. across every ACC of an ACN)
+    instead of spinning up new worker threads for each batch.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="station-api")
+    return _executor
+
+
+def shutdown_executor():
+    """
+    Shut down the shared worker pool, if it was started.
+    Calls still waiting for a worker are cancelled rather than run.
+    """
+    global _executor
+    if _executor is not None:
+        with _active_futures_lock:
+            for future in _active_futures:
+                future.cancel()
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+@contextmanager
+def batched_stdout():
+    """
+    Switch off stdout line buffering for a progress loop.
+    On a terminal stdout flushes on every newline, so without this the
+    loop's periodic flush would save nothing. The original setting is
+    restored (and stdout flushed) on exit, also on Ctrl+C.
+    """
+    line_buffered = getattr(sys.stdout, "line_buffering", False) and hasattr(sys.stdout, "reconfigure")
+    if line_buffered:
+        sys.stdout.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        if line_buffered:
+            sys.stdout.reconfigure(line_buffering=True)
+
+
+def run_concurrently(func, items: List[Any]):
+    """
+    Call func(item) for each item on the shared worker pool, yielding
+    (item, result) pairs in completion order. Calls that have not started
+    yet are cancelled if the caller stops early (e.g. on Ctrl+C).
+    Must not be called from inside a pool worker. Callers that hold on to
+    the generator should close it (e.g. with contextlib.closing) so that
+    cancellation also happens when they stop early.
+    """
+    if not items:
+        return
+    
+    executor = get_executor()
+    futures = {executor.submit(func, item): item for item in items}
+    with _active_futures_lock:
+        _active_futures.update(futures)
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        with _active_futures_lock:
+            _active_futures.difference_update(futures)
+
+
+def fetch_configurations_bulk(pfids: List[str], key: str) -> Dict[str, Dict[str, Any]]:
+    """Get a configuration value from many stations concurrently, keyed by PFID."""
+    return dict(run_concurrently(lambda pfid: get_configuration(pfid, key), pfids))
+
+
+def encode_configuration_change(key, value) -> str:
+    """Encode a change_configuration request body, e.g. once for many stations."""
+    return json_dumps({"key": key, "value": value})
+
+
 def set_configuration(pfid, key, value):
     """Set a configuration value on a station."""
+    return set_configuration_raw(pfid, encode_configuration_change(key, value))
+
+
+def set_configuration_raw(pfid, body: str):
+    """Set a configuration value on a station from an encoded request body."""
     url = f"https://powerflex.io/edge-device-manager/ocppCommands/change_configuration/{pfid}"
-    cmd = [
-        "curl_device_manager.sh",
-        "-X", "POST",
-        url,
-        "-H", "accept: application/json",
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps({"key": key, "value": value})
-    ]
+    # Keys can depend on each other (e.g. PricingScheduleEnable), so drop them all
+    invalidate_configuration(pfid)
     try:
-        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        return json.loads(result.stdout)
+        return json_loads(device_manager_request("POST", url, body))
     except subprocess.CalledProcessError as e:
         return {"error": str(e)}
     except json.JSONDecodeError:
         return {"error": "Invalid JSON response"}
 
 
-def extract_pricing_schedule(response):
-    """Extract pricing schedule from the API response."""
+def set_configurations_bulk(pfids: List[str], key: str, value):
+    """
+    Set the same configuration value on many stations concurrently,
+    yielding (pfid, response) pairs as each station answers.
+    """
+    body = encode_configuration_change(key, value)
+    return run_concurrently(lambda pfid: set_configuration_raw(pfid, body), pfids)
+
+
+def interpret_set_response(result) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Interpret a set_configuration response.
+    Returns (update_status, station_status, reason) where update_status is
+    "accepted", "rejected" or "error".
+    """
+    nats_response = result.get("natsResponse", {})
+    if not isinstance(nats_response, dict):
+        return "error", None, str(nats_response) if nats_response else "Unknown error"
+    
+    status = nats_response.get("status", "Unknown")
+    if status == "Accepted":
+        return "accepted", status, None
+    
+    # Try various fields where rejection reason might be
+    if "error" in nats_response:
+        reason = nats_response.get("error")
+    elif "message" in nats_response:
+        reason = nats_response.get("message")
+    elif "reason" in nats_response:
+        reason = nats_response.get("reason")
+    else:
+        # Include full response if no specific reason found
+        reason = json.dumps(nats_response)
+    return "rejected", status, reason
+
+
+def extract_pricing_fields(response) -> Tuple[Optional[list], Optional[bool]]:
+    """
+    Extract (PricingSchedule, PricingScheduleEnable) from the API response.
+    The configuration keys are indexed once, so a response carrying both
+    keys is only walked a single time.
+    """
     try:
         config_keys = response.get("natsResponse", {}).get("configuration_key", [])
+        items = {}
         for item in config_keys:
-            if item.get("key") == "PricingSchedule":
-                return json.loads(item.get("value", "[]"))
-    except (json.JSONDecodeError, TypeError, KeyError):
-        pass
-    return None
+            items.setdefault(item.get("key"), item)
+    except (TypeError, KeyError, AttributeError):
+        return None, None
+    
+    schedule = None
+    schedule_item = items.get("PricingSchedule")
+    if schedule_item is not None:
+        # Only the matching key's value is decoded; a null/empty value is an empty schedule
+        try:
+            schedule = json_loads(schedule_item.get("value") or "[]")
+        except (json.JSONDecodeError, TypeError):
+            pass
+    
+    enabled = None
+    enable_item = items.get("PricingScheduleEnable")
+    if enable_item is not None:
+        try:
+            enabled = enable_item.get("value", "").lower() == "true"
+        except AttributeError:
+            pass
+    
+    return schedule, enabled
+
+
+def extract_pricing_schedule(response):
+    """Extract pricing schedule from the API response."""
+    return extract_pricing_fields(response)[0]
 
 
 def extract_pricing_enabled(response):
     """Extract PricingScheduleEnable from the API response."""
-    try:
-        config_keys = response.get("natsResponse", {}).get("configuration_key", [])
-        for item in config_keys:
-            if item.get("key") == "PricingScheduleEnable":
-                val = item.get("value", "").lower()
-                return val == "true"
-    except (TypeError, KeyError):
-        pass
-    return None
+    return extract_pricing_fields(response)[1]
+
+
+def is_correct_schedule(schedule, expected_f=0.5) -> bool:
+    """Return True if the schedule is non-empty and every f value equals expected_f."""
+    # Stops at the first mismatch; any f value (even a list or dict) compares safely
+    return bool(schedule) and all(entry.get("f") == expected_f for entry in schedule)
 
 
 def check_schedule_values(schedule, expected_f=0.5):
     """Check if all f values match the expected value."""
     if not schedule:
         return None, []
+    # Fast path: nothing to collect when everything matches
+    if is_correct_schedule(schedule, expected_f):
+        return True, []
     mismatches = []
     for entry in schedule:
         t = entry.get("t")
@@ -939,6 +1542,16 @@ def check_schedule_values(schedule, expected_f=0.5):
     return len(mismatches) == 0, mismatches
 
 
+@lru_cache(maxsize=None)
+def is_liteon_model(evse_type: str) -> bool:
+    """
+    Check if an evse_type is a LiteON model (case insensitive).
+    Results are memoized: a site only has a handful of distinct model
+    strings, so each is lower-cased and searched once.
+    """
+    return "liteon" in evse_type.lower()
+
+
 def format_schedule(schedule):
     """Format schedule as a readable string."""
     if not schedule:
@@ -950,6 +1563,48 @@ def format_schedule(schedule):
 # ============================================================================
 # Main Processing Functions
 # ============================================================================
+def check_station(pfid: str, acn_id: str, acc_id: str, expected_f: float = 0.5) -> Tuple[Dict, bool]:
+    """
+    Check one station's PricingSchedule, enabling PricingScheduleEnable if
+    needed. Safe to run from worker threads.
+    
+    Returns:
+        tuple: (result dict, whether the station had to be enabled)
+    """
+    # Get PricingScheduleEnable and PricingSchedule in a single round trip
+    response = get_configuration_keys(pfid, ["PricingScheduleEnable", "PricingSchedule"])
+    schedule, enabled = extract_pricing_fields(response)
+    
+    # If not enabled (unknown or false), enable it then re-read the schedule
+    enabled_now = enabled is not True
+    if enabled_now:
+        set_configuration(pfid, "PricingScheduleEnable", "true")
+        enabled = True
+        schedule = extract_pricing_schedule(get_configuration(pfid, "PricingSchedule"))
+    
+    # Check for mismatches against expected value (fast path when all correct)
+    all_correct, mismatches = check_schedule_values(schedule, expected_f=expected_f)
+    
+    # Extract ACG and ACS from PFID for tracking
+    pfid_parts = pfid.split("-")
+    station_acg = pfid_parts[2] if len(pfid_parts) > 2 else None
+    station_acs = pfid_parts[3] if len(pfid_parts) > 3 else None
+    
+    result = {
+        "pfid": pfid,
+        "acn_id": acn_id,
+        "acc_id": acc_id,
+        "acg_id": station_acg,
+        "acs_id": station_acs,
+        "schedule": schedule,
+        "enabled": enabled,
+        "all_correct": all_correct,
+        "mismatches": mismatches,
+        "expected_f": expected_f
+    }
+    return result, enabled_now
+
+
 def process_stations(acn_id: str, acc_id: str, acg_id: str = None, acs_id: str = None, 
                      all_results: List[Dict] = None, expected_f: float = 0.5) -> List[Dict]:
     """
@@ -970,7 +1625,7 @@ def process_stations(acn_id: str, acc_id: str, acg_id: str = None, acs_id: str =
     print(f"{'─'*70}")
     
     print("  📡 Fetching station data...")
-    stations = fetch_station_data(acn_id, acc_id)
+    stations = get_station_index(acn_id, acc_id)
     
     if not stations:
         print("  ⚠️  No stations found for this ACC")
@@ -979,36 +1634,32 @@ def process_stations(acn_id: str, acc_id: str, acg_id: str = None, acs_id: str =
     # Build PFID prefix for filtering
     pfid_prefix = build_pfid_prefix(acn_id, acc_id, acg_id, acs_id) if acg_id else None
     
+    # Narrow to the PFID prefix if specified (ACG or ACS level)
+    matching = stations_with_prefix(stations, pfid_prefix)
+    filtered_out = len(stations) - len(matching)
+    
     # Filter for LiteON stations only (case insensitive)
-    liteon_entries = []
+    # (hot loop over every station: lookups are bound to locals once)
+    pfids = []
     other_models = {}
-    filtered_out = 0
+    add_pfid = pfids.append
+    is_liteon = is_liteon_model
+    count_for = other_models.get
     
-    for entry in stations.values():
-        if not entry.get("pfid"):
-            continue
-        
-        pfid = entry.get("pfid")
-        
-        # Filter by PFID prefix if specified (ACG or ACS level)
-        if pfid_prefix:
-            if not pfid.startswith(pfid_prefix):
-                filtered_out += 1
-                continue
-        
+    for pfid, entry in matching:
         evse_type = entry.get("evse_type", "Unknown")
-        if "liteon" in evse_type.lower():
-            liteon_entries.append(entry)
+        if is_liteon(evse_type):
+            add_pfid(pfid)
         else:
-            other_models[evse_type] = other_models.get(evse_type, 0) + 1
-    
-    pfids = [entry.get("pfid") for entry in liteon_entries]
+            other_models[evse_type] = count_for(evse_type, 0) + 1
     
     print(f"  🔋 LiteON stations to check: {len(pfids)}")
     if filtered_out > 0:
         print(f"  🚫 Filtered out (different ACG/ACS): {filtered_out}")
     if other_models:
-        print(f"  ⏭️  Skipping other models: {dict(sorted(other_models.items(), key=lambda x: -x[1]))}")
+        top_models = heapq.nlargest(10, other_models.items(), key=operator.itemgetter(1))
+        more = f" (+{len(other_models) - len(top_models)} more)" if len(other_models) > len(top_models) else ""
+        print(f"  ⏭️  Skipping other models: {dict(top_models)}{more}")
     
     if not pfids:
         if pfid_prefix:
@@ -1021,46 +1672,21 @@ def process_stations(acn_id: str, acc_id: str, acg_id: str = None, acs_id: str =
         all_results = []
     
     print("")
-    for i, pfid in enumerate(pfids, 1):
-        print(f"  [{i}/{len(pfids)}] 🔍 {pfid}...", end=" ", flush=True)
-        
-        # Get PricingScheduleEnable first
-        enable_response = get_configuration(pfid, "PricingScheduleEnable")
-        enabled = extract_pricing_enabled(enable_response)
-        
-        # If not enabled (unknown or false), enable it first then recheck
-        if enabled is not True:
-            print("enabling...", end=" ", flush=True)
-            set_configuration(pfid, "PricingScheduleEnable", "true")
-            enabled = True
-        
-        # Get PricingSchedule
-        schedule_response = get_configuration(pfid, "PricingSchedule")
-        schedule = extract_pricing_schedule(schedule_response)
-        
-        # Check for mismatches against expected value
-        all_correct, mismatches = check_schedule_values(schedule, expected_f=expected_f)
-        
-        # Extract ACG and ACS from PFID for tracking
-        pfid_parts = pfid.split("-")
-        station_acg = pfid_parts[2] if len(pfid_parts) > 2 else None
-        station_acs = pfid_parts[3] if len(pfid_parts) > 3 else None
-        
-        all_results.append({
-            "pfid": pfid,
-            "acn_id": acn_id,
-            "acc_id": acc_id,
-            "acg_id": station_acg,
-            "acs_id": station_acs,
-            "schedule": schedule,
-            "enabled": enabled,
-            "all_correct": all_correct,
-            "mismatches": mismatches,
-            "expected_f": expected_f
-        })
-        
-        status = "✅" if all_correct else "❌" if all_correct is False else "❓"
-        print(status)
+    check = partial(check_station, acn_id=acn_id, acc_id=acc_id, expected_f=expected_f)
+    checked = {}
+    write = sys.stdout.write
+    with batched_stdout():
+        for i, (pfid, (result, enabled_now)) in enumerate(run_concurrently(check, pfids), 1):
+            checked[pfid] = result
+            all_correct = result["all_correct"]
+            enabling = "enabling... " if enabled_now else ""
+            status = "✅" if all_correct else "❌" if all_correct is False else "❓"
+            write(f"  [{i}/{len(pfids)}] 🔍 {pfid}... {enabling}{status}\n")
+            if i % PROGRESS_FLUSH_EVERY == 0:
+                sys.stdout.flush()
+    
+    # Keep results in station order regardless of completion order
+    all_results.extend(checked[pfid] for pfid in pfids)
     
     return all_results
 
@@ -1077,10 +1703,16 @@ def print_results(results: List[Dict], expected_f: float = 0.5):
     print(f"  📋 RESULTS")
     print(f"{'='*70}\n")
     
-    # Separate into correct and odd-ones-out
-    correct = [r for r in results if r["all_correct"] is True]
-    odd_ones = [r for r in results if r["all_correct"] is False]
-    unknown = [r for r in results if r["all_correct"] is None]
+    # Separate into correct, odd-ones-out and unknown in a single pass
+    correct, odd_ones, unknown = [], [], []
+    for r in results:
+        all_correct = r["all_correct"]
+        if all_correct is True:
+            correct.append(r)
+        elif all_correct is False:
+            odd_ones.append(r)
+        elif all_correct is None:
+            unknown.append(r)
     
     # Print odd ones out first (the important ones)
     if odd_ones:
@@ -1205,57 +1837,46 @@ def prompt_update_odd_ones(odd_ones, correct_stations, skip_prompt: bool = False
         accepted_count = 0
         rejected_count = 0
         
-        for i, r in enumerate(odd_ones, 1):
-            pfid = r["pfid"]
-            station_expected_f = r.get("expected_f", expected_f)
-            
-            # Generate schedule for this station's expected_f
-            station_schedule = get_correct_schedule([], expected_f=station_expected_f)
-            station_schedule_str = json.dumps(station_schedule)
-            
-            print(f"  [{i}/{len(odd_ones)}] {pfid} (f={station_expected_f})...", end=" ", flush=True)
-            
-            result = set_configuration(pfid, "PricingSchedule", station_schedule_str)
-            
-            nats_response = result.get("natsResponse", {})
-            if isinstance(nats_response, dict):
-                status = nats_response.get("status", "Unknown")
-                if status == "Accepted":
+        # Group stations by expected value so each schedule is encoded once
+        stations_by_f = defaultdict(list)
+        for r in odd_ones:
+            stations_by_f[r.get("expected_f", expected_f)].append(r["pfid"])
+        
+        station_expected_f = {r["pfid"]: r.get("expected_f", expected_f) for r in odd_ones}
+        
+        def update_results():
+            for f, pfids in stations_by_f.items():
+                yield from set_configurations_bulk(pfids, "PricingSchedule",
+                                                   json.dumps(get_correct_schedule([], expected_f=f)))
+        
+        # Status changes are written in one go when the batch closes (also on Ctrl+C);
+        # closing the results first cancels updates that have not been sent yet
+        with StatusBatch(site_key) as batch, closing(update_results()) as results, batched_stdout():
+            for i, (pfid, result) in enumerate(results, 1):
+                print(f"  [{i}/{len(odd_ones)}] {pfid} (f={station_expected_f[pfid]})...", end=" ")
+                
+                update_status, status, reason = interpret_set_response(result)
+                if update_status == "accepted":
                     print("✅ Accepted")
-                    update_odd_ones_status(pfid, "accepted", site_key=site_key)
                     accepted_count += 1
-                else:
-                    # Extract rejection reason from the response
-                    rejection_reason = None
-                    
-                    # Try various fields where rejection reason might be
-                    if "error" in nats_response:
-                        rejection_reason = nats_response.get("error")
-                    elif "message" in nats_response:
-                        rejection_reason = nats_response.get("message")
-                    elif "reason" in nats_response:
-                        rejection_reason = nats_response.get("reason")
-                    else:
-                        # Include full response if no specific reason found
-                        rejection_reason = json.dumps(nats_response)
-                    
+                elif update_status == "rejected":
                     print(f"⚠️  {status}")
-                    if rejection_reason:
-                        print(f"          Reason: {rejection_reason}")
-                    
-                    update_odd_ones_status(pfid, "rejected", rejection_reason, site_key=site_key)
+                    if reason:
+                        print(f"          Reason: {reason}")
                     rejected_count += 1
-            else:
-                error_msg = str(nats_response) if nats_response else "Unknown error"
-                print(f"❌ {error_msg}")
-                update_odd_ones_status(pfid, "error", error_msg, site_key=site_key)
-                rejected_count += 1
-            
-            # Check for error in the result itself
-            if "error" in result:
-                error_msg = result.get("error")
-                print(f"          ❌ Error: {error_msg}")
-                update_odd_ones_status(pfid, "error", error_msg, site_key=site_key)
+                else:
+                    print(f"❌ {reason}")
+                    rejected_count += 1
+                batch.set(pfid, update_status, reason)
+                
+                # Check for error in the result itself
+                if "error" in result:
+                    error_msg = result.get("error")
+                    print(f"          ❌ Error: {error_msg}")
+                    batch.set(pfid, "error", error_msg)
+                
+                if i % PROGRESS_FLUSH_EVERY == 0:
+                    sys.stdout.flush()
         
         print(f"\n  ✅ Update complete!")
         print(f"     ✅ Accepted: {accepted_count}")
@@ -1321,16 +1942,22 @@ def main_pfid(pfid_info: Dict[str, Optional[str]], resume_progress: Dict = None)
         
         if resume_progress and resume_progress.get('acn_id') == acn:
             completed_accs = resume_progress.get('completed_accs', [])
-            all_results = resume_progress.get('results', [])
+            # Older progress files kept the results inline
+            if 'results' in resume_progress:
+                all_results = resume_progress['results']
+            else:
+                all_results = load_progress_results(completed_accs)
             print(f"[INFO] Resuming from previous run. {len(completed_accs)} ACC(s) already completed.")
         
-        # Initialize progress
+        # Start the results file over with only the results being kept
+        write_progress_results(all_results, append=False)
+        
+        # Initialize progress (results are stored in PROGRESS_RESULTS_FILE)
         progress = {
             "mode": "acn-only",
             "acn_id": acn,
             "total_accs": len(accs),
             "completed_accs": completed_accs,
-            "results": all_results,
             "pricing_mode": pricing_mode,
             "pricing_values": pricing_values,
             "started_at": resume_progress.get('started_at') if resume_progress else datetime.now().isoformat()
@@ -1346,12 +1973,13 @@ def main_pfid(pfid_info: Dict[str, Optional[str]], resume_progress: Dict = None)
             expected_f = get_pricing_value_for_acc(acn, acc_id, pricing_mode, pricing_values)
             
             print(f"\n[{i}/{len(accs)}] Processing ACC: {acc_id}")
-            all_results = process_stations(acn, acc_id, all_results=all_results, expected_f=expected_f)
+            acc_results = process_stations(acn, acc_id, expected_f=expected_f)
+            all_results.extend(acc_results)
             
-            # Update progress
+            # Update progress (results first, so a completed ACC always has its results saved)
+            write_progress_results(acc_results)
             completed_accs.append(acc_id)
             progress['completed_accs'] = completed_accs
-            progress['results'] = all_results
             progress['pricing_values'] = pricing_values  # Save updated values
             save_progress(progress)
         
@@ -1522,7 +2150,7 @@ def main_retry_site(site_key: str):
     print(f"  First saved: {saved_at} ({age_str})")
     print(f"  Last updated: {last_updated}")
     
-    stations = site_data.get("stations", [])
+    stations = list(site_data.get("stations", {}).values())
     correct_schedule = site_data.get("correct_schedule", [])
     
     if not stations:
@@ -1584,47 +2212,36 @@ def main_retry_site(site_key: str):
     accepted_count = 0
     rejected_count = 0
     
-    for i, s in enumerate(to_retry, 1):
-        pfid = s["pfid"]
-        print(f"[{i}/{len(to_retry)}] Updating {pfid}...", end=" ", flush=True)
-        
-        result = set_configuration(pfid, "PricingSchedule", correct_schedule_str)
-        
-        nats_response = result.get("natsResponse", {})
-        if isinstance(nats_response, dict):
-            status = nats_response.get("status", "Unknown")
-            if status == "Accepted":
+    update_results = set_configurations_bulk([s["pfid"] for s in to_retry], "PricingSchedule",
+                                             correct_schedule_str)
+    
+    # Status changes are written in one go when the batch closes (also on Ctrl+C);
+    # closing the results first cancels updates that have not been sent yet
+    with StatusBatch(site_key) as batch, closing(update_results) as results, batched_stdout():
+        for i, (pfid, result) in enumerate(results, 1):
+            print(f"[{i}/{len(to_retry)}] Updating {pfid}...", end=" ")
+            
+            update_status, status, reason = interpret_set_response(result)
+            if update_status == "accepted":
                 print("✓ Accepted")
-                update_odd_ones_status(pfid, "accepted", site_key=site_key)
                 accepted_count += 1
-            else:
-                rejection_reason = None
-                
-                if "error" in nats_response:
-                    rejection_reason = nats_response.get("error")
-                elif "message" in nats_response:
-                    rejection_reason = nats_response.get("message")
-                elif "reason" in nats_response:
-                    rejection_reason = nats_response.get("reason")
-                else:
-                    rejection_reason = json.dumps(nats_response)
-                
+            elif update_status == "rejected":
                 print(f"⚠ {status}")
-                if rejection_reason:
-                    print(f"      Reason: {rejection_reason}")
-                
-                update_odd_ones_status(pfid, "rejected", rejection_reason, site_key=site_key)
+                if reason:
+                    print(f"      Reason: {reason}")
                 rejected_count += 1
-        else:
-            error_msg = str(nats_response) if nats_response else "Unknown error"
-            print(f"? {error_msg}")
-            update_odd_ones_status(pfid, "error", error_msg, site_key=site_key)
-            rejected_count += 1
-        
-        if "error" in result:
-            error_msg = result.get("error")
-            print(f"      Error: {error_msg}")
-            update_odd_ones_status(pfid, "error", error_msg, site_key=site_key)
+            else:
+                print(f"? {reason}")
+                rejected_count += 1
+            batch.set(pfid, update_status, reason)
+            
+            if "error" in result:
+                error_msg = result.get("error")
+                print(f"      Error: {error_msg}")
+                batch.set(pfid, "error", error_msg)
+            
+            if i % PROGRESS_FLUSH_EVERY == 0:
+                sys.stdout.flush()
     
     print(f"\n[INFO] Retry complete for site {site_key}.")
     print(f"  Accepted: {accepted_count}")
@@ -1655,6 +2272,7 @@ def main():
             main_retry()
         finally:
             stop_jwt_refresh_timer()
+            shutdown_executor()
         return
     
     # Parse arguments - support flexible PFID input
@@ -1714,6 +2332,7 @@ def main():
     finally:
         # Clean up
         stop_jwt_refresh_timer()
+        shutdown_executor()
 
 
 if __name__ == "__main__":